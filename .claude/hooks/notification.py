@@ -27,6 +27,9 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+# Import TTS helpers (resolved from this script's directory)
+from utils.tts.client import silent_env
+
 # Constants
 LOG_DIR = Path("logs")
 TTS_TIMEOUT = 10
@@ -67,14 +70,10 @@ def announce_notification() -> None:
         notification_message = "Your agent needs your input"
     
     try:
-        # Prepare environment for silent mode
-        env = os.environ.copy()
-        env['TTS_SILENT_MODE'] = 'true'
-        
-        # Execute TTS script
+        # Execute TTS script in silent mode
         subprocess.run(
             ["uv", "run", tts_script, notification_message],
-            env=env,
+            env=silent_env(),
             stderr=subprocess.DEVNULL,
             stdout=subprocess.DEVNULL,
             timeout=TTS_TIMEOUT
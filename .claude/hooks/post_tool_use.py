@@ -2,23 +2,41 @@
 # /// script
 # requires-python = ">=3.8"
 # dependencies = [
+#     "orjson",
 #     "python-dotenv",
 # ]
 # ///
 
-import json
+import functools
 import os
-import sys
-import subprocess
 import random
 import re
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+# Import common utilities (resolved from this script's directory)
+from utils.common import load_dotenv_if_needed
+from utils.hook_runner import record_error, run
+from utils.tts import client as tts_client
+
+load_dotenv_if_needed(('ENGINEER_NAME', 'ELEVENLABS_API_KEY'))
+
+# Environment read once per process; it does not change while a hook runs
+_ENGINEER_NAME = os.getenv('ENGINEER_NAME', '').strip()
+
+# Greeting message variations, built once
+_GREETINGS = (
+    "Hello! How can I help you today?",
+    "Hi there! What can I do for you?",
+    "Greetings! Ready to assist.",
+)
+if _ENGINEER_NAME:
+    _GREETINGS += (
+        f"Hello {_ENGINEER_NAME}! How can I help you today?",
+        f"Hi {_ENGINEER_NAME}! What can I do for you?",
+    )
+# The default (first) greeting is used half the time; otherwise any greeting
+# is picked uniformly
+_GREETING_WEIGHTS = (len(_GREETINGS) + 1,) + (1,) * (len(_GREETINGS) - 1)
 
 # MESSAGE TYPE CONFIGURATION
 # Toggle these to enable/disable TTS for specific message types
@@ -39,9 +57,41 @@ MESSAGE_TYPE_CONFIG = {
     "unknown": True          # Unclassified messages
 }
 
+# Precompiled patterns used on every hook invocation
+_TOOL_OUTPUT_PREFIX_RE = re.compile(r'^\d+→')
+_NUMBERED_RE = re.compile(r'^\d+\.')
+_BULLET_RES = [
+    re.compile(r'^\s*[-*•○■▪→▸►]\s+(.+)$'),  # Various bullet symbols
+    re.compile(r'^\s*\d+[.)]\s+(.+)$'),        # Numbered lists (1. or 1))
+]
+
+# Keyword phrases per message category (matched as lowercase substrings)
+MESSAGE_KEYWORDS = {
+    "notification": ("waiting for your input", "needs your input"),
+    "greeting": ("hello", "hi there", "greetings", "how can i help", "what can i do for you"),
+    "error": ("error", "failed", "cannot", "unable", "invalid"),
+    "confirmation": ("done", "fixed", "completed", "finished", "created", "updated", "successfully"),
+    "status_update": ("now", "currently", "starting", "checking", "running", "processing"),
+    "instruction": ("first", "next", "then", "step"),
+    "explanation": ("because", "since", "this means", "the reason", "works by"),
+}
+CLASSIFY_HEAD_CHARS = 256
+MAX_CLASSIFY_LENGTH = 4096  # Longer messages are treated as tool output
+BULLET_SCAN_LINES = 100
+QUESTION_PREFIXES = ("should", "would", "could", "can", "do", "does")
+
+# One alternation over every category; the zero-width lookahead lets finditer
+# report overlapping matches so a single pass yields all categories present
+_KEYWORD_CLASSIFIER = re.compile("(?=" + "|".join(
+    f"(?P<{category}>{'|'.join(map(re.escape, phrases))})"
+    for category, phrases in MESSAGE_KEYWORDS.items()
+) + ")")
+
+@functools.lru_cache(maxsize=1)
 def get_tts_script_path():
     """
     Determine which TTS script to use based on available API keys.
+    The result is cached for the lifetime of the process.
     """
     # Get current script directory and construct utils/tts path
     script_dir = Path(__file__).parent
@@ -63,34 +113,18 @@ def announce_notification():
         if not tts_script:
             return  # No TTS scripts available
 
-        # Get engineer name if available
-        engineer_name = os.getenv('ENGINEER_NAME', '').strip()
-
         # Create notification message with 30% chance to include name
-        if engineer_name and random.random() < 0.3:
-            notification_message = f"{engineer_name}, your agent needs your input"
+        if _ENGINEER_NAME and random.random() < 0.3:
+            notification_message = f"{_ENGINEER_NAME}, your agent needs your input"
         else:
             notification_message = "Your agent needs your input"
 
-        # Set environment for silent mode
-        env = os.environ.copy()
-        env['TTS_SILENT_MODE'] = 'true'
-        
-        # Call the TTS script with the notification message
-        subprocess.run([
-            "uv", "run", tts_script, notification_message
-        ],
-        env=env,
-        stderr=subprocess.DEVNULL,  # Suppress stderr only
-        timeout=10  # 10-second timeout
-        )
-
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        # Fail silently if TTS encounters issues
-        pass
-    except Exception:
-        # Fail silently for any other errors
-        pass
+        # Hand the notification message to the TTS daemon
+        tts_client.speak(notification_message)
+
+    except OSError as e:
+        # TTS is advisory; note the failure and carry on
+        record_error('post_tool_use', e)
 
 
 def announce_completion(message=None):
@@ -100,36 +134,20 @@ def announce_completion(message=None):
         if not tts_script:
             return  # No TTS scripts available
 
-        # Get engineer name if available
-        engineer_name = os.getenv('ENGINEER_NAME', '').strip()
-
         # Create completion message
         if message:
             completion_message = message
-        elif engineer_name and random.random() < 0.3:
-            completion_message = f"{engineer_name}, I've completed the task"
+        elif _ENGINEER_NAME and random.random() < 0.3:
+            completion_message = f"{_ENGINEER_NAME}, I've completed the task"
         else:
             completion_message = "Task completed"
 
-        # Set environment for silent mode
-        env = os.environ.copy()
-        env['TTS_SILENT_MODE'] = 'true'
-        
-        # Call the TTS script with the completion message
-        subprocess.run([
-            "uv", "run", tts_script, completion_message
-        ],
-        env=env,
-        stderr=subprocess.DEVNULL,  # Suppress stderr only
-        timeout=10  # 10-second timeout
-        )
-
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        # Fail silently if TTS encounters issues
-        pass
-    except Exception:
-        # Fail silently for any other errors
-        pass
+        # Hand the completion message to the TTS daemon
+        tts_client.speak(completion_message)
+
+    except OSError as e:
+        # TTS is advisory; note the failure and carry on
+        record_error('post_tool_use', e)
 
 
 def announce_greeting():
@@ -139,104 +157,73 @@ def announce_greeting():
         if not tts_script:
             return  # No TTS scripts available
 
-        # Get engineer name if available
-        engineer_name = os.getenv('ENGINEER_NAME', '').strip()
-
-        # Create greeting message variations
-        greetings = [
-            "Hello! How can I help you today?",
-            "Hi there! What can I do for you?",
-            "Greetings! Ready to assist.",
-        ]
-        
-        if engineer_name:
-            greetings.extend([
-                f"Hello {engineer_name}! How can I help you today?",
-                f"Hi {engineer_name}! What can I do for you?",
-            ])
-        
         # Pick a random greeting
-        greeting_message = random.choice(greetings) if random.random() < 0.5 else "Hello! How can I help you today?"
+        greeting_message = random.choices(_GREETINGS, weights=_GREETING_WEIGHTS)[0]
 
-        # Set environment for silent mode
-        env = os.environ.copy()
-        env['TTS_SILENT_MODE'] = 'true'
-        
-        # Call the TTS script with the greeting message
-        subprocess.run([
-            "uv", "run", tts_script, greeting_message
-        ],
-        env=env,
-        stderr=subprocess.DEVNULL,  # Suppress stderr only
-        timeout=10  # 10-second timeout
-        )
-
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        # Fail silently if TTS encounters issues
-        pass
-    except Exception:
-        # Fail silently for any other errors
-        pass
+        # Hand the greeting message to the TTS daemon
+        tts_client.speak(greeting_message)
+
+    except OSError as e:
+        # TTS is advisory; note the failure and carry on
+        record_error('post_tool_use', e)
 
 
 def detect_message_type(message: str) -> str:
     """Detect the type of message based on content patterns."""
-    message_lower = message.lower()
+    # Very long messages are virtually always tool output; skip the scans
+    if len(message) > MAX_CLASSIFY_LENGTH:
+        return "tool_output"
     
-    # Check for specific patterns in order of priority
+    # Keywords are only looked for near the front of the message, so avoid
+    # copying the whole (possibly multi-kB) body just to lowercase it
+    message_lower = message[:CLASSIFY_HEAD_CHARS].lower()
     
     # Tool output patterns
-    if (message.startswith("File ") or message.startswith("Directory ") or 
-        message.startswith("Output:") or re.match(r'^\d+→', message)):
+    if (message.startswith(("File ", "Directory ", "Output:")) or
+            _TOOL_OUTPUT_PREFIX_RE.match(message)):
         return "tool_output"
     
     # Code blocks
     if "```" in message:
         return "code_block"
     
-    # Notification/waiting patterns
-    if "waiting for your input" in message_lower or "needs your input" in message_lower:
+    # Collect every keyword category present in a single scan
+    found = {match.lastgroup for match in _KEYWORD_CLASSIFIER.finditer(message_lower)}
+    
+    # Check for specific patterns in order of priority
+    if "notification" in found:
         return "notification"
     
-    # Greeting patterns
-    if any(phrase in message_lower for phrase in ["hello", "hi there", "greetings", "how can i help", "what can i do for you"]):
+    if "greeting" in found:
         return "greeting"
     
-    # Error patterns
-    if any(word in message_lower for word in ["error", "failed", "cannot", "unable", "invalid"]):
+    if "error" in found:
         return "error"
     
     # Question patterns
-    if message.strip().endswith("?") or message_lower.startswith(("should", "would", "could", "can", "do", "does")):
+    if message.rstrip().endswith("?") or message_lower.startswith(QUESTION_PREFIXES):
         return "question"
     
     # Summary/bullet patterns
     if extract_bullet_points(message):
         return "summary"
     
-    # Confirmation patterns
-    confirmation_words = ["done", "fixed", "completed", "finished", "created", "updated", "successfully"]
-    if any(word in message_lower for word in confirmation_words) and len(message) < 100:
-        return "confirmation"
-    
-    # Completion patterns (longer messages about completing tasks)
-    if any(word in message_lower for word in confirmation_words):
-        return "completion"
+    # Confirmation patterns (short) vs completion (longer messages about completing tasks)
+    if "confirmation" in found:
+        return "confirmation" if len(message) < 100 else "completion"
     
-    # Status update patterns
-    if any(word in message_lower for word in ["now", "currently", "starting", "checking", "running", "processing"]):
+    if "status_update" in found:
         return "status_update"
     
     # Instruction patterns
-    if re.match(r'^\d+\.', message) or any(word in message_lower for word in ["first", "next", "then", "step"]):
+    if _NUMBERED_RE.match(message) or "instruction" in found:
         return "instruction"
     
-    # Explanation patterns
-    if any(phrase in message_lower for phrase in ["because", "since", "this means", "the reason", "works by"]):
+    if "explanation" in found:
         return "explanation"
     
-    # Direct answer patterns
-    if len(message.split()) <= 5 and not message.endswith("?"):
+    # Direct answer patterns (maxsplit stops counting after the sixth word)
+    if len(message.split(maxsplit=5)) <= 5 and not message.endswith("?"):
         return "direct_answer"
     
     return "unknown"
@@ -245,17 +232,13 @@ def detect_message_type(message: str) -> str:
 def extract_bullet_points(text):
     """Extract bullet points from text."""
     # Find lines that start with bullets (-, *, •, ○, ■, etc.)
-    bullet_patterns = [
-        r'^\s*[-*•○■▪→▸►]\s+(.+)$',  # Various bullet symbols
-        r'^\s*\d+[.)]\s+(.+)$',        # Numbered lists (1. or 1))
-    ]
-    
     bullets = []
-    lines = text.split('\n')
+    # Only the first BULLET_SCAN_LINES lines are considered
+    lines = text.split('\n', BULLET_SCAN_LINES)[:BULLET_SCAN_LINES]
     
     for line in lines:
-        for pattern in bullet_patterns:
-            match = re.match(pattern, line, re.MULTILINE)
+        for pattern in _BULLET_RES:
+            match = pattern.match(line)
             if match:
                 bullets.append(match.group(1).strip())
                 break
@@ -287,91 +270,50 @@ def announce_bullets(message):
             # Join with "and" for the last item
             announcement = ", ".join(bullets_to_read[:-1]) + ", and " + bullets_to_read[-1]
         
-        # Set environment for silent mode
-        env = os.environ.copy()
-        env['TTS_SILENT_MODE'] = 'true'
-        
-        # Call the TTS script
-        subprocess.run([
-            "uv", "run", tts_script, announcement
-        ],
-        env=env,
-        stderr=subprocess.DEVNULL,
-        timeout=15  # Longer timeout for potentially longer text
-        )
+        # Hand the announcement to the TTS daemon
+        tts_client.speak(announcement)
         
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        pass
-    except Exception:
-        pass
+    except OSError as e:
+        # TTS is advisory; note the failure and carry on
+        record_error('post_tool_use', e)
 
 
-def main():
-    try:
-        # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
-        
-        # Ensure log directory exists
-        log_dir = Path.cwd() / 'logs'
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_path = log_dir / 'post_tool_use.json'
-        
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-        
-        # Append new data
-        log_data.append(input_data)
-        
-        # Write back to file with formatting
-        with open(log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+def handle_post_tool_use(input_data):
+    """Announce the tool result via TTS according to its message type."""
+    # Check the message to determine what to announce
+    message = input_data.get('message', '')
+    
+    # Detect the message type
+    msg_type = detect_message_type(message)
+    
+    # Log the detected type for debugging
+    input_data['detected_type'] = msg_type
+    input_data['tts_enabled'] = MESSAGE_TYPE_CONFIG.get(msg_type, False)
+    
+    # Check if TTS is enabled for this message type
+    if not MESSAGE_TYPE_CONFIG.get(msg_type, False):
+        return  # Exit early if TTS disabled for this type
+    
+    # Announce based on message type
+    if msg_type == "summary":
+        announce_bullets(message)
+    elif msg_type == "greeting":
+        announce_greeting()
+    elif msg_type in ["confirmation", "completion"]:
+        announce_completion(message if len(message) < 50 else None)
+    elif msg_type == "notification":
+        announce_notification()
+    elif msg_type in ["error", "question", "status_update"]:
+        # For these types, announce a shortened version
+        lines = message.split('\n')
+        short_msg = lines[0] if lines else message
+        if len(short_msg) > 100:
+            short_msg = short_msg[:100] + "..."
+        announce_completion(short_msg)
 
-        # Check the message to determine what to announce
-        message = input_data.get('message', '')
-        
-        # Detect the message type
-        msg_type = detect_message_type(message)
-        
-        # Log the detected type for debugging
-        input_data['detected_type'] = msg_type
-        input_data['tts_enabled'] = MESSAGE_TYPE_CONFIG.get(msg_type, False)
-        
-        # Check if TTS is enabled for this message type
-        if not MESSAGE_TYPE_CONFIG.get(msg_type, False):
-            sys.exit(0)  # Exit early if TTS disabled for this type
-        
-        # Announce based on message type
-        if msg_type == "summary":
-            announce_bullets(message)
-        elif msg_type == "greeting":
-            announce_greeting()
-        elif msg_type in ["confirmation", "completion"]:
-            announce_completion(message if len(message) < 50 else None)
-        elif msg_type == "notification":
-            announce_notification()
-        elif msg_type in ["error", "question", "status_update"]:
-            # For these types, announce a shortened version
-            lines = message.split('\n')
-            short_msg = lines[0] if lines else message
-            if len(short_msg) > 100:
-                short_msg = short_msg[:100] + "..."
-            announce_completion(short_msg)
-        
-        sys.exit(0)
-        
-    except json.JSONDecodeError:
-        # Handle JSON decode errors gracefully
-        sys.exit(0)
-    except Exception:
-        # Exit cleanly on any other error
-        sys.exit(0)
+
+def main():
+    run('post_tool_use', handle_post_tool_use)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
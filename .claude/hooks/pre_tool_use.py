@@ -1,6 +1,9 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.8"
+# dependencies = [
+#     "orjson",
+# ]
 # ///
 
 """Pre-tool use hook for Claude Code.
@@ -11,47 +14,53 @@ Validates and filters tool calls before execution:
 - Logs tool usage
 """
 
-import json
 import sys
 import re
-from pathlib import Path
 from typing import Dict, Any, Tuple, Optional
 
-# Import common utilities
-sys.path.insert(0, str(Path(__file__).parent))
-from utils.common import (
-    ensure_log_dir,
-    load_json_log,
-    save_json_log
-)
+# Import common utilities (resolved from this script's directory)
+from utils.hook_runner import log_event, run
 
 # Constants
+# rm checks run on the raw command: case-insensitive, and '.' spans newlines
+RM_FLAGS = re.IGNORECASE | re.DOTALL
+
+FILE_TOOLS = frozenset({'Read', 'Edit', 'MultiEdit', 'Write'})
+GUARDED_TOOLS = FILE_TOOLS | {'Bash'}
+
 DANGEROUS_RM_PATTERNS = [
-    r'\brm\s+.*-[a-z]*r[a-z]*f',  # rm -rf, rm -fr, rm -Rf, etc.
-    r'\brm\s+.*-[a-z]*f[a-z]*r',  # rm -fr variations
-    r'\brm\s+--recursive\s+--force',  # rm --recursive --force
-    r'\brm\s+--force\s+--recursive',  # rm --force --recursive
-    r'\brm\s+-r\s+.*-f',  # rm -r ... -f
-    r'\brm\s+-f\s+.*-r',  # rm -f ... -r
+    re.compile(r'\brm\s+.*-[a-z]*r[a-z]*f', RM_FLAGS),  # rm -rf, rm -fr, rm -Rf, etc.
+    re.compile(r'\brm\s+.*-[a-z]*f[a-z]*r', RM_FLAGS),  # rm -fr variations
+    re.compile(r'\brm\s+--recursive\s+--force', RM_FLAGS),  # rm --recursive --force
+    re.compile(r'\brm\s+--force\s+--recursive', RM_FLAGS),  # rm --force --recursive
+    re.compile(r'\brm\s+-r\s+.*-f', RM_FLAGS),  # rm -r ... -f
+    re.compile(r'\brm\s+-f\s+.*-r', RM_FLAGS),  # rm -f ... -r
 ]
 
 DANGEROUS_PATHS = [
-    r'/',           # Root directory
-    r'/\*',         # Root with wildcard
-    r'~',           # Home directory
-    r'~/',          # Home directory path
-    r'\$HOME',      # Home environment variable
+    re.compile(r'/', RM_FLAGS),           # Root directory
+    re.compile(r'/\*', RM_FLAGS),         # Root with wildcard
+    re.compile(r'~', RM_FLAGS),           # Home directory
+    re.compile(r'~/', RM_FLAGS),          # Home directory path
+    re.compile(r'\$HOME', RM_FLAGS),      # Home environment variable
 ]
 
+RM_RECURSIVE_PATTERN = re.compile(r'\brm\s+.*-[a-z]*r', RM_FLAGS)
+
 ENV_FILE_PATTERNS = [
-    r'\b\.env\b(?!\.sample)',  # .env but not .env.sample
-    r'cat\s+.*\.env\b(?!\.sample)',  # cat .env
-    r'echo\s+.*>\s*\.env\b(?!\.sample)',  # echo > .env
-    r'touch\s+.*\.env\b(?!\.sample)',  # touch .env
-    r'cp\s+.*\.env\b(?!\.sample)',  # cp .env
-    r'mv\s+.*\.env\b(?!\.sample)',  # mv .env
+    re.compile(r'\b\.env\b(?!\.sample)'),  # .env but not .env.sample
+    re.compile(r'cat\s+.*\.env\b(?!\.sample)'),  # cat .env
+    re.compile(r'echo\s+.*>\s*\.env\b(?!\.sample)'),  # echo > .env
+    re.compile(r'touch\s+.*\.env\b(?!\.sample)'),  # touch .env
+    re.compile(r'cp\s+.*\.env\b(?!\.sample)'),  # cp .env
+    re.compile(r'mv\s+.*\.env\b(?!\.sample)'),  # mv .env
 ]
 
+# Each pattern family fused into one alternation so a single search decides it
+_DANGEROUS_RM_RE = re.compile('|'.join(f'(?:{p.pattern})' for p in DANGEROUS_RM_PATTERNS), RM_FLAGS)
+_DANGEROUS_PATH_RE = re.compile('|'.join(f'(?:{p.pattern})' for p in DANGEROUS_PATHS), RM_FLAGS)
+_ENV_FILE_RE = re.compile('|'.join(f'(?:{p.pattern})' for p in ENV_FILE_PATTERNS))
+
 
 def is_dangerous_rm_command(command: str) -> bool:
     """Check if a command is a dangerous rm operation.
@@ -65,21 +74,15 @@ def is_dangerous_rm_command(command: str) -> bool:
     if not command:
         return False
     
-    # Normalize command for pattern matching
-    normalized = ' '.join(command.lower().split())
-    
     # Check for dangerous rm patterns
-    for pattern in DANGEROUS_RM_PATTERNS:
-        if re.search(pattern, normalized):
-            return True
+    if _DANGEROUS_RM_RE.search(command):
+        return True
     
     # Check for rm with recursive flag targeting dangerous paths
-    if re.search(r'\brm\s+.*-[a-z]*r', normalized):
-        for path_pattern in DANGEROUS_PATHS:
-            if re.search(path_pattern, normalized):
-                return True
-    
-    return False
+    return bool(
+        RM_RECURSIVE_PATTERN.search(command)
+        and _DANGEROUS_PATH_RE.search(command)
+    )
 
 def is_env_file_access(tool_name: str, tool_input: Dict[str, Any]) -> bool:
     """Check if a tool is trying to access sensitive .env files.
@@ -91,11 +94,8 @@ def is_env_file_access(tool_name: str, tool_input: Dict[str, Any]) -> bool:
     Returns:
         True if accessing .env files, False otherwise
     """
-    # Tools that can access files
-    file_tools = ['Read', 'Edit', 'MultiEdit', 'Write']
-    
     # Check file-based tools
-    if tool_name in file_tools:
+    if tool_name in FILE_TOOLS:
         file_path = tool_input.get('file_path', '')
         if '.env' in file_path and not file_path.endswith('.env.sample'):
             return True
@@ -103,9 +103,8 @@ def is_env_file_access(tool_name: str, tool_input: Dict[str, Any]) -> bool:
     # Check bash commands for .env access
     elif tool_name == 'Bash':
         command = tool_input.get('command', '')
-        for pattern in ENV_FILE_PATTERNS:
-            if re.search(pattern, command):
-                return True
+        if _ENV_FILE_RE.search(command):
+            return True
     
     return False
 
@@ -122,6 +121,10 @@ def validate_tool_call(
     Returns:
         Tuple of (is_valid, error_message)
     """
+    # Only file and Bash tools can reach sensitive files or run commands
+    if tool_name not in GUARDED_TOOLS:
+        return True, None
+    
     # Check for .env file access
     if is_env_file_access(tool_name, tool_input):
         return False, "Access to .env files containing sensitive data is prohibited. Use .env.sample for template files instead"
@@ -135,55 +138,37 @@ def validate_tool_call(
     return True, None
 
 
-def log_tool_use(input_data: Dict[str, Any]) -> None:
-    """Log pre-tool use event.
+def handle_tool_call(input_data: Dict[str, Any]) -> int:
+    """Validate a tool call and log it if allowed.
     
     Args:
-        input_data: Tool use data to log
+        input_data: Pre-tool use event data
+        
+    Returns:
+        Hook exit code (2 blocks the tool call)
     """
-    log_dir = ensure_log_dir()
-    log_file = log_dir / 'pre_tool_use.json'
+    # Extract tool information
+    tool_name = input_data.get('tool_name', '')
+    tool_input = input_data.get('tool_input', {})
     
-    # Load existing log
-    log_data = load_json_log(log_file)
+    # Validate the tool call
+    is_valid, error_message = validate_tool_call(tool_name, tool_input)
     
-    # Append new data
-    log_data.append(input_data)
+    if not is_valid:
+        # Block the tool call with error message
+        print(f"BLOCKED: {error_message}", file=sys.stderr)
+        return 2  # Exit code 2 blocks tool call
     
-    # Save updated log
-    save_json_log(log_file, log_data)
+    # Log the tool use
+    log_event('pre_tool_use', input_data)
+    
+    return 0  # Allow tool to proceed
 
 
 def main() -> None:
     """Main entry point for pre-tool use hook."""
-    try:
-        # Read and parse JSON input
-        try:
-            input_data = json.loads(sys.stdin.read())
-        except json.JSONDecodeError:
-            sys.exit(0)  # Gracefully exit on invalid JSON
-        
-        # Extract tool information
-        tool_name = input_data.get('tool_name', '')
-        tool_input = input_data.get('tool_input', {})
-        
-        # Validate the tool call
-        is_valid, error_message = validate_tool_call(tool_name, tool_input)
-        
-        if not is_valid:
-            # Block the tool call with error message
-            print(f"BLOCKED: {error_message}", file=sys.stderr)
-            sys.exit(2)  # Exit code 2 blocks tool call
-        
-        # Log the tool use
-        log_tool_use(input_data)
-        
-        sys.exit(0)  # Allow tool to proceed
-        
-    except KeyboardInterrupt:
-        sys.exit(0)
-    except Exception:
-        sys.exit(0)  # Exit gracefully on any error
+    # Blocked calls are not logged, so the handler logs after validating
+    run('pre_tool_use', handle_tool_call, log_input=False)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
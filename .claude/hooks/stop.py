@@ -2,6 +2,7 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "orjson",
 #     "python-dotenv",
 # ]
 # ///
@@ -15,34 +16,24 @@ Handles session stop events with:
 """
 
 import argparse
-import json
 import os
-import sys
 import random
-from pathlib import Path
 from typing import Dict, Any
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
-
-# Import common utilities
-sys.path.insert(0, str(Path(__file__).parent))
+# Import common utilities (resolved from this script's directory)
 from utils.common import (
+    load_dotenv_if_needed,
     ensure_log_dir,
-    load_json_log,
-    save_json_log,
     run_tts,
     process_transcript,
     get_llm_message,
-    DEFAULT_MESSAGES
+    DEFAULT_MESSAGES,
+    LLM_ENV_KEYS,
+    TTS_ENV_KEYS
 )
+from utils.hook_runner import run
 
-
-
-
+load_dotenv_if_needed(TTS_ENV_KEYS + LLM_ENV_KEYS)
 
 
 def get_completion_message() -> str:
@@ -66,25 +57,6 @@ def announce_completion() -> None:
     run_tts(completion_message, silent=True)
 
 
-def log_stop_event(input_data: Dict[str, Any]) -> None:
-    """Log stop event to JSON file.
-    
-    Args:
-        input_data: The stop event data to log
-    """
-    log_dir = ensure_log_dir()
-    log_file = log_dir / "stop.json"
-    
-    # Load existing log data
-    log_data = load_json_log(log_file)
-    
-    # Append new data
-    log_data.append(input_data)
-    
-    # Save updated log
-    save_json_log(log_file, log_data)
-
-
 def handle_chat_transcript(
     input_data: Dict[str, Any]
 ) -> None:
@@ -125,34 +97,26 @@ def parse_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def handle_stop(input_data: Dict[str, Any], args: argparse.Namespace) -> None:
+    """Handle a stop event that has already been logged.
+    
+    Args:
+        input_data: The stop event data
+        args: Parsed command line arguments
+    """
+    # Handle chat transcript if requested
+    if args.chat:
+        handle_chat_transcript(input_data)
+    
+    # Announce completion via TTS if enabled
+    if args.notify:
+        announce_completion()
+
+
 def main() -> None:
     """Main entry point for the stop hook."""
-    try:
-        args = parse_arguments()
-        
-        # Read and parse JSON input
-        try:
-            input_data = json.loads(sys.stdin.read())
-        except json.JSONDecodeError:
-            sys.exit(0)  # Gracefully exit on invalid JSON
-        
-        # Log the stop event
-        log_stop_event(input_data)
-        
-        # Handle chat transcript if requested
-        if args.chat:
-            handle_chat_transcript(input_data)
-        
-        # Announce completion via TTS if enabled
-        if args.notify:
-            announce_completion()
-        
-        sys.exit(0)
-        
-    except KeyboardInterrupt:
-        sys.exit(0)
-    except Exception:
-        sys.exit(0)  # Exit gracefully on any error
+    args = parse_arguments()
+    run('stop', lambda input_data: handle_stop(input_data, args))
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "orjson",
 #     "python-dotenv",
 # ]
 # ///
@@ -17,58 +18,62 @@ Handles user prompt submission events with:
 """
 
 import argparse
+import functools
 import json
 import os
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple, Dict, Any
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+# Import common utilities (resolved from this script's directory)
+from utils.common import (
+    dumps_json,
+    load_dotenv_if_needed,
+    locked_append,
+    read_json_file,
+    write_all,
+    write_json_atomic
+)
+from utils.hook_runner import record_error, run
+from utils.tts import client as tts_client
 
 
 # Constants
-LOG_DIR = Path("logs")
 SESSIONS_DIR = Path(".claude/data/sessions")
+AGENT_NAMES_FILE = Path(".claude/data/agent_names.json")
 DEFAULT_ENGINEER_NAME = "Boss B"
-TTS_TIMEOUT = 5
+DOTENV_KEYS = ('ENGINEER_NAME', 'ELEVENLABS_API_KEY', 'ANTHROPIC_API_KEY')
 LLM_TIMEOUT_SHORT = 5  # For Ollama
 LLM_TIMEOUT_LONG = 10  # For Anthropic
+ANNOUNCE_JOIN_TIMEOUT = 1.0  # Seconds to wait for the TTS hand-off on exit
 
+# Task keyword mappings, in priority order; all keywords are plain
+# substrings of the lowercased prompt, so no regex is needed
+TASK_MAPPINGS = [
+    (("clean", "folder", "directory"), "cleaning up your project folder"),
+    (("next.js", "nextjs"), "setting up Next.js"),
+    (("test",), "running tests"),
+    (("fix",), "fixing issues in your code"),
+    (("create", "add"), "creating new components"),
+    (("update", "change", "modify"), "updating your configuration"),
+    (("remove", "delete"), "removing files"),
+    (("refactor",), "refactoring code"),
+    (("deploy",), "deploying your application"),
+    (("install",), "installing dependencies"),
+    (("debug",), "debugging the application"),
+    (("optimize",), "optimizing performance"),
+]
 
-def log_user_prompt(session_id: str, input_data: Dict[str, Any]) -> None:
-    """Log user prompt to logs directory.
-    
-    Args:
-        session_id: The session identifier
-        input_data: The complete input data to log
-    """
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    log_file = LOG_DIR / 'user_prompt_submit.json'
-    
-    # Read existing log data with error handling
-    log_data = []
-    if log_file.exists():
-        try:
-            with open(log_file, 'r') as f:
-                log_data = json.load(f)
-                if not isinstance(log_data, list):
-                    log_data = []
-        except (json.JSONDecodeError, ValueError, IOError):
-            log_data = []
-    
-    # Append and save
-    log_data.append(input_data)
-    
-    try:
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
-    except IOError:
-        pass  # Fail silently if unable to write
+# Blocked prompt patterns with reasons (matched case-insensitively)
+BLOCKED_PATTERNS = [
+    # Add any patterns you want to block
+    # Example: ('rm -rf /', 'Dangerous command detected'),
+]
+_BLOCKED_PATTERNS_LOWER = tuple(
+    (pattern.lower(), reason) for pattern, reason in BLOCKED_PATTERNS
+)
 
 
 # Legacy function removed - now handled by manage_session_data
@@ -83,15 +88,20 @@ def generate_agent_name() -> Optional[str]:
     import subprocess
     
     # Try Ollama first (local, faster)
+    llm_dir = Path(__file__).parent / "utils" / "llm"
     llm_configs = [
-        (".claude/hooks/utils/llm/ollama.py", LLM_TIMEOUT_SHORT),
-        (".claude/hooks/utils/llm/anth.py", LLM_TIMEOUT_LONG)
+        (llm_dir / "ollama.py", LLM_TIMEOUT_SHORT),
+        (llm_dir / "anth.py", LLM_TIMEOUT_LONG)
     ]
     
     for script_path, timeout in llm_configs:
+        # Don't pay for a `uv run` start-up just to find the script missing
+        if not script_path.exists():
+            continue
+        
         try:
             result = subprocess.run(
-                ["uv", "run", script_path, "--agent-name"],
+                ["uv", "run", str(script_path), "--agent-name"],
                 capture_output=True,
                 text=True,
                 timeout=timeout
@@ -108,12 +118,92 @@ def generate_agent_name() -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
+def load_agent_names() -> Dict[str, str]:
+    """Load the session_id -> agent name cache, once per process.
+    
+    Returns:
+        Mapping of session identifiers to previously generated agent names
+    """
+    try:
+        names = read_json_file(AGENT_NAMES_FILE)
+        return names if isinstance(names, dict) else {}
+    except (json.JSONDecodeError, ValueError, IOError):
+        return {}
+
+
+def remember_agent_name(session_id: str, agent_name: str) -> None:
+    """Add a generated agent name to the cache file.
+    
+    The file is re-read under a lock so names added by concurrent hooks
+    are merged rather than overwritten.
+    
+    Args:
+        session_id: The session identifier
+        agent_name: The generated agent name
+    """
+    agent_names = load_agent_names()
+    agent_names[session_id] = agent_name
+    
+    lock_file = AGENT_NAMES_FILE.with_name(f"{AGENT_NAMES_FILE.name}.lock")
+    try:
+        with locked_append(lock_file):
+            try:
+                on_disk = read_json_file(AGENT_NAMES_FILE)
+            except FileNotFoundError:
+                on_disk = {}
+            if not isinstance(on_disk, dict):
+                return  # Leave an unexpected file alone rather than clobber it
+            on_disk[session_id] = agent_name
+            write_json_atomic(AGENT_NAMES_FILE, on_disk)
+    except (json.JSONDecodeError, ValueError, OSError):
+        pass  # The name is still cached for this process
+
+
+def migrate_session_file(session_id: str, prompts_fd: int) -> None:
+    """Split a legacy {session_id}.json file into meta and prompt files once.
+    
+    Runs only when the session's prompt log is first created, with it
+    locked, so concurrent hooks migrate only once.
+    
+    Args:
+        session_id: The session identifier
+        prompts_fd: Locked descriptor of {session_id}.prompts.jsonl
+    """
+    legacy_file = SESSIONS_DIR / f"{session_id}.json"
+    try:
+        legacy_data = read_json_file(legacy_file)
+    except FileNotFoundError:
+        return  # Already migrated or never existed
+    except (json.JSONDecodeError, ValueError):
+        legacy_data = None  # Unreadable; nothing to carry over
+    
+    try:
+        if isinstance(legacy_data, dict):
+            write_all(prompts_fd, b''.join(
+                dumps_json(prompt) + b'\n'
+                for prompt in legacy_data.get("prompts", [])
+            ))
+            if "agent_name" in legacy_data:
+                write_json_atomic(SESSIONS_DIR / f"{session_id}.meta.json", {
+                    "session_id": session_id,
+                    "agent_name": legacy_data["agent_name"]
+                })
+        
+        legacy_file.unlink()
+    except OSError:
+        pass  # Keep the new prompt even if the legacy file can't be carried over
+
+
 def manage_session_data(
     session_id: str, 
     prompt: str, 
     name_agent: bool = False
 ) -> None:
-    """Manage session data in JSON structure.
+    """Manage per-session data files.
+    
+    Prompts are appended to {session_id}.prompts.jsonl; the agent name
+    lives in a small {session_id}.meta.json written only when it is set.
     
     Args:
         session_id: The session identifier
@@ -121,37 +211,42 @@ def manage_session_data(
         name_agent: Whether to generate an agent name
     """
     SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
-    session_file = SESSIONS_DIR / f"{session_id}.json"
     
-    # Load or initialize session data
-    session_data = {"session_id": session_id, "prompts": []}
-    if session_file.exists():
-        try:
-            with open(session_file, 'r') as f:
-                loaded_data = json.load(f)
-                if isinstance(loaded_data, dict):
-                    session_data = loaded_data
-                    # Ensure prompts list exists
-                    if "prompts" not in session_data:
-                        session_data["prompts"] = []
-        except (json.JSONDecodeError, ValueError, IOError):
-            pass  # Use default initialized data
-    
-    # Add the new prompt
-    session_data["prompts"].append(prompt)
-    
-    # Generate agent name if requested and not present
-    if name_agent and "agent_name" not in session_data:
-        agent_name = generate_agent_name()
-        if agent_name:
-            session_data["agent_name"] = agent_name
+    # Add the new prompt; a new prompt log first carries over any legacy
+    # session file under the same lock
+    try:
+        with locked_append(
+            SESSIONS_DIR / f"{session_id}.prompts.jsonl",
+            on_create=lambda fd: migrate_session_file(session_id, fd)
+        ) as fd:
+            write_all(fd, dumps_json(prompt) + b'\n')
+    except OSError as e:
+        # Still name and validate the prompt; just note the lost append
+        record_error('user_prompt_submit', e)
+    
+    if not name_agent:
+        return
     
-    # Save the updated session data
+    # Generate agent name if not present
+    # (reuse a cached name so a reset session file never costs another LLM call)
+    meta_file = SESSIONS_DIR / f"{session_id}.meta.json"
     try:
-        with open(session_file, 'w') as f:
-            json.dump(session_data, f, indent=2)
-    except IOError:
-        pass  # Fail silently
+        meta = read_json_file(meta_file)
+        if isinstance(meta, dict) and "agent_name" in meta:
+            return
+    except (json.JSONDecodeError, ValueError, IOError):
+        pass  # Name the session below
+    
+    agent_name = load_agent_names().get(session_id)
+    if not agent_name:
+        agent_name = generate_agent_name()
+        if agent_name:
+            remember_agent_name(session_id, agent_name)
+    if agent_name:
+        write_json_atomic(meta_file, {
+            "session_id": session_id,
+            "agent_name": agent_name
+        })
 
 
 def validate_prompt(prompt: str) -> Tuple[bool, Optional[str]]:
@@ -163,19 +258,14 @@ def validate_prompt(prompt: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, reason_if_invalid)
     """
-    # Define blocked patterns with reasons
-    blocked_patterns = [
-        # Add any patterns you want to block
-        # Example: ('rm -rf /', 'Dangerous command detected'),
-    ]
-    
-    if not prompt:
+    # Nothing to check: skip lowercasing a potentially large prompt
+    if not prompt or not _BLOCKED_PATTERNS_LOWER:
         return True, None
     
     prompt_lower = prompt.lower()
     
-    for pattern, reason in blocked_patterns:
-        if pattern.lower() in prompt_lower:
+    for pattern, reason in _BLOCKED_PATTERNS_LOWER:
+        if pattern in prompt_lower:
             return False, reason
     
     return True, None
@@ -195,28 +285,10 @@ def summarize_prompt(prompt: str) -> str:
     
     prompt_lower = prompt.lower()
     
-    # Task keyword mappings
-    task_mappings = [
-        (("clean", "folder|directory"), "cleaning up your project folder"),
-        (("next\\.js", "nextjs"), "setting up Next.js"),
-        (("test",), "running tests"),
-        (("fix",), "fixing issues in your code"),
-        (("create", "add"), "creating new components"),
-        (("update", "change", "modify"), "updating your configuration"),
-        (("remove", "delete"), "removing files"),
-        (("refactor",), "refactoring code"),
-        (("deploy",), "deploying your application"),
-        (("install",), "installing dependencies"),
-        (("debug",), "debugging the application"),
-        (("optimize",), "optimizing performance"),
-    ]
-    
-    # Check for task patterns
-    import re
-    for patterns, summary in task_mappings:
-        for pattern in patterns:
-            if re.search(pattern, prompt_lower):
-                return summary
+    # Check for task keywords
+    for keywords, summary in TASK_MAPPINGS:
+        if any(keyword in prompt_lower for keyword in keywords):
+            return summary
     
     return "working on your request"
 
@@ -230,8 +302,6 @@ def announce_task_start(prompt: str) -> None:
     if not prompt:
         return
     
-    import subprocess
-    
     # Get engineer name from environment
     engineer_name = os.getenv('ENGINEER_NAME', DEFAULT_ENGINEER_NAME).strip()
     if not engineer_name:
@@ -250,19 +320,11 @@ def announce_task_start(prompt: str) -> None:
         return
     
     try:
-        # Prepare environment for silent mode
-        env = os.environ.copy()
-        env['TTS_SILENT_MODE'] = 'true'
-        
-        subprocess.run(
-            ["uv", "run", str(tts_script), message],
-            env=env,
-            stderr=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL,
-            timeout=TTS_TIMEOUT
-        )
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError):
-        pass  # Fail silently
+        # Hand the announcement to the persistent TTS daemon
+        tts_client.speak(message)
+    except OSError as e:
+        # TTS is advisory; note the failure and carry on
+        record_error('user_prompt_submit', e)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -302,55 +364,64 @@ def parse_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def main() -> None:
-    """Main entry point for the hook."""
-    try:
-        args = parse_arguments()
-        
-        # Read and parse JSON input
-        try:
-            input_data = json.loads(sys.stdin.read())
-        except json.JSONDecodeError:
-            sys.exit(0)  # Gracefully exit on invalid JSON
-        
-        # Extract required fields
-        session_id = input_data.get('session_id', 'unknown')
-        prompt = input_data.get('prompt', '')
-        
-        # Execute hook actions in order
-        
-        # 1. Announce task start (if requested)
-        if args.announce_start and prompt:
-            announce_task_start(prompt)
-        
-        # 2. Log the user prompt
-        log_user_prompt(session_id, input_data)
-        
-        # 3. Manage session data
-        if args.store_last_prompt or args.name_agent:
-            manage_session_data(
-                session_id, 
-                prompt, 
-                name_agent=args.name_agent
-            )
-        
-        # 4. Validate prompt (if requested and not in log-only mode)
-        if args.validate and not args.log_only and prompt:
-            is_valid, reason = validate_prompt(prompt)
-            if not is_valid:
-                # Exit code 2 blocks the prompt with error message
-                print(f"Prompt blocked: {reason}", file=sys.stderr)
-                sys.exit(2)
-        
-        # Success - prompt will be processed
-        sys.exit(0)
+def handle_user_prompt(input_data: Dict[str, Any], args: argparse.Namespace) -> int:
+    """Handle a user prompt event that has already been logged.
+    
+    Args:
+        input_data: The user prompt event data
+        args: Parsed command line arguments
         
-    except KeyboardInterrupt:
-        sys.exit(0)
-    except Exception:
-        # Handle any unexpected errors gracefully
-        sys.exit(0)
+    Returns:
+        Exit code (2 blocks the prompt)
+    """
+    # Only announcements and agent naming consume .env settings
+    if args.announce_start or args.name_agent:
+        load_dotenv_if_needed(DOTENV_KEYS)
+    
+    # Extract required fields
+    session_id = input_data.get('session_id', 'unknown')
+    prompt = input_data.get('prompt', '')
+    
+    # Execute hook actions in order
+    
+    # 1. Announce task start (if requested) alongside the session writes
+    # rather than ahead of them
+    announcer = None
+    if args.announce_start and prompt:
+        announcer = threading.Thread(
+            target=announce_task_start, args=(prompt,), daemon=True
+        )
+        announcer.start()
+    
+    # 2. Manage session data
+    if args.store_last_prompt or args.name_agent:
+        manage_session_data(
+            session_id, 
+            prompt, 
+            name_agent=args.name_agent
+        )
+    
+    # Give the announcement a moment to hand off before the process exits
+    if announcer is not None:
+        announcer.join(ANNOUNCE_JOIN_TIMEOUT)
+    
+    # 3. Validate prompt (if requested and not in log-only mode)
+    if args.validate and not args.log_only and prompt:
+        is_valid, reason = validate_prompt(prompt)
+        if not is_valid:
+            # Exit code 2 blocks the prompt with error message
+            print(f"Prompt blocked: {reason}", file=sys.stderr)
+            return 2
+    
+    # Success - prompt will be processed
+    return 0
+
+
+def main() -> None:
+    """Main entry point for the user prompt submit hook."""
+    args = parse_arguments()
+    run('user_prompt_submit', lambda input_data: handle_user_prompt(input_data, args))
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1 @@
+"""Shared helpers for Claude Code hook scripts."""
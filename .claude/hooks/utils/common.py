@@ -1,11 +1,27 @@
 #!/usr/bin/env python3
 """Common utilities shared across hook scripts."""
 
+import contextlib
+import functools
+import hashlib
 import json
+import mmap
 import os
 import subprocess
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple
+
+from utils.tts import client as tts_client
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson is optional; fall back to the stdlib json module
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # fcntl is POSIX-only; writes go unlocked elsewhere
 
 
 # Constants
@@ -18,11 +34,154 @@ DEFAULT_MESSAGES = [
     "Job complete!",
     "Ready for next task!"
 ]
+MMAP_MIN_SIZE = 64 * 1024  # Smaller files are cheaper to read() outright
+TRANSCRIPT_BUFFER_SIZE = 1 << 20  # Read/write buffer for transcript copies
+TTS_ENV_KEYS = ('ELEVENLABS_API_KEY', 'OPENAI_API_KEY')  # Read by get_tts_script_path
+LLM_ENV_KEYS = ('OPENAI_API_KEY', 'ANTHROPIC_API_KEY')  # Read by get_llm_options
+DOTENV_CACHE_DIR = Path.home() / ".cache" / "claude-hooks"
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to JSON bytes, using orjson when available.
+    
+    Args:
+        data: JSON-serializable data
+        indent: Whether to pretty-print with two-space indentation
+        
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
 
 
+def loads_json(data: Any) -> Any:
+    """Parse a JSON document from bytes or str, using orjson when available.
+    
+    Args:
+        data: Encoded JSON document
+        
+    Returns:
+        Parsed data
+        
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json_file(path: Path) -> Any:
+    """Parse a JSON file, memory-mapping large files when orjson is available.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed data
+        
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return loads_json(f.read())
+        
+        # orjson parses straight from the mapped pages without a read() copy
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def load_dotenv_if_needed(keys: Iterable[str]) -> None:
+    """Load .env unless the shell already exports every hook setting.
+    
+    Skips the dotenv import, .env search and parse when all of the given
+    variables are already present in the environment, or entirely when
+    CLAUDE_SKIP_DOTENV=1.
+    
+    Args:
+        keys: Every environment variable the hook reads
+    """
+    if os.environ.get('CLAUDE_SKIP_DOTENV') == '1':
+        return
+    if all(key in os.environ for key in keys):
+        return
+    
+    load_dotenv_cached(keys)
+
+
+def load_dotenv_cached(keys: Iterable[str], dotenv_path: Path = Path(".env")) -> None:
+    """Load the given keys from a .env file through a per-file cache.
+    
+    Only the requested keys are loaded and cached, so secrets the hook
+    never reads are not copied out of .env. Each .env path and key set
+    gets its own cache file under DOTENV_CACHE_DIR, revalidated against
+    the file's mtime and size. Without a .env in the working directory
+    this falls back to dotenv's own search. Like load_dotenv(), variables
+    already set are not overridden.
+    
+    Args:
+        keys: Environment variables to load
+        dotenv_path: The .env file to load
+    """
+    try:
+        from dotenv import load_dotenv, dotenv_values
+    except ImportError:
+        load_dotenv = dotenv_values = None  # dotenv is optional
+    
+    try:
+        stat = os.stat(dotenv_path)
+    except OSError:
+        if load_dotenv:
+            load_dotenv()
+        return
+    
+    keys = sorted(set(keys))
+    env_file = os.path.abspath(dotenv_path)
+    digest = hashlib.sha256("\0".join([env_file, *keys]).encode('utf-8')).hexdigest()
+    cache_file = DOTENV_CACHE_DIR / f"env-{digest[:16]}.json"
+    cache_key = [env_file, stat.st_mtime_ns, stat.st_size]
+    try:
+        cache = read_json_file(cache_file)
+    except (json.JSONDecodeError, ValueError, OSError):
+        cache = None
+    
+    if isinstance(cache, dict) and cache.get('key') == cache_key:
+        values = cache.get('values', {})
+    elif dotenv_values:
+        parsed = dotenv_values(dotenv_path)
+        values = {key: parsed[key] for key in keys if parsed.get(key) is not None}
+        # The cache holds secrets, so keep it private to the user
+        old_umask = os.umask(0o077)
+        try:
+            DOTENV_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(cache_file, {'key': cache_key, 'values': values})
+        except OSError:
+            pass  # Caching is best effort
+        finally:
+            os.umask(old_umask)
+    else:
+        return
+    
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+
+
+@functools.lru_cache(maxsize=1)
 def ensure_log_dir() -> Path:
     """Ensure the log directory exists.
     
+    Cached so the directory is only created once per process.
+    
     Returns:
         Path to the log directory
     """
@@ -43,13 +202,44 @@ def load_json_log(log_file: Path) -> List[Dict[str, Any]]:
         return []
     
     try:
-        with open(log_file, 'r') as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
+        data = read_json_file(log_file)
+        return data if isinstance(data, list) else []
     except (json.JSONDecodeError, ValueError, IOError):
         return []
 
 
+def write_json_atomic(path: Path, data: Any) -> bool:
+    """Write compact JSON to a file via a temporary file and atomic rename.
+    
+    Readers never observe a partially written file, even if the writer
+    is interrupted.
+    
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        # Serialize up front and hand the whole buffer to one os.write
+        buf = dumps_json(data)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            write_all(fd, buf)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+        return True
+    except IOError:
+        try:
+            tmp_path.unlink()
+        except IOError:
+            pass
+        return False
+
+
 def save_json_log(log_file: Path, log_data: List[Dict[str, Any]]) -> bool:
     """Save JSON log file safely.
     
@@ -57,22 +247,110 @@ def save_json_log(log_file: Path, log_data: List[Dict[str, Any]]) -> bool:
         log_file: Path to the JSON log file
         log_data: List of log entries to save
         
+    Returns:
+        True if successful, False otherwise
+    """
+    return write_json_atomic(log_file, log_data)
+
+
+@contextlib.contextmanager
+def locked_append(
+    path: Path,
+    on_create: Optional[Callable[[int], None]] = None
+) -> Iterator[int]:
+    """Open a file for appending under an exclusive flock.
+    
+    Concurrent hooks appending to the same file are serialized, so lines
+    are never interleaved or torn. The lock is released on close.
+    
+    Args:
+        path: File to append to (created if missing)
+        on_create: Called with the locked descriptor when this call
+            created the file, e.g. to carry over a legacy file once
+        
+    Yields:
+        File descriptor opened with O_APPEND
+    """
+    created = False
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    except FileNotFoundError:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        created = True
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        if created and on_create is not None:
+            on_create(fd)
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def write_all(fd: int, data: bytes) -> None:
+    """Write all of data to a file descriptor.
+    
+    Args:
+        fd: Open file descriptor
+        data: Bytes to write
+    """
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def migrate_json_log(log_file: Path, fd: int) -> None:
+    """Carry a legacy JSON array log over into a newly created JSON Lines log.
+    
+    Runs only when the .jsonl file is first created, so appends to an
+    existing log never look for the legacy file.
+    
+    Args:
+        log_file: Path to the .jsonl log file; its .json sibling is migrated
+        fd: Locked descriptor of the new .jsonl file
+    """
+    legacy_file = log_file.with_suffix('.json')
+    # Another hook that also created the file may have migrated it already
+    if not legacy_file.exists():
+        return
+    
+    try:
+        write_all(fd, b''.join(
+            dumps_json(entry) + b'\n' for entry in load_json_log(legacy_file)
+        ))
+        legacy_file.unlink()
+    except IOError:
+        pass  # Keep appending even if the legacy log can't be carried over
+
+
+def append_json_log(log_file: Path, entry: Any) -> bool:
+    """Append a single entry to a JSON Lines log file.
+    
+    Args:
+        log_file: Path to the .jsonl log file
+        entry: Log entry to append (any JSON-serializable value)
+        
     Returns:
         True if successful, False otherwise
     """
     try:
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        with locked_append(
+            log_file, on_create=lambda fd: migrate_json_log(log_file, fd)
+        ) as fd:
+            write_all(fd, dumps_json(entry) + b'\n')
         return True
     except IOError:
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_tts_script_path() -> Optional[str]:
     """Get the path to the appropriate TTS script.
     
     Priority: ElevenLabs > OpenAI > pyttsx3
     
+    The result is cached for the lifetime of the process.
+    
     Returns:
         Path to TTS script or None if unavailable
     """
@@ -103,26 +381,33 @@ def run_tts(message: str, silent: bool = True) -> bool:
         silent: Whether to suppress console output
         
     Returns:
-        True if successful, False otherwise
+        True if the message was handed off, False if no TTS is available
+        or the script timed out
+        
+    Raises:
+        OSError, subprocess.SubprocessError: If the TTS script cannot run;
+            hook_runner.run records these in logs/hook_errors.jsonl
     """
     tts_script = get_tts_script_path()
     if not tts_script:
         return False
     
     try:
-        env = os.environ.copy()
-        if silent:
-            env['TTS_SILENT_MODE'] = 'true'
+        # The ElevenLabs voice is served by the persistent TTS daemon, which
+        # avoids starting a new interpreter per announcement
+        if silent and Path(tts_script).name == tts_client.FALLBACK_SCRIPT.name:
+            tts_client.speak(message)
+            return True
         
         subprocess.run(
             ["uv", "run", tts_script, message],
-            env=env,
+            env=tts_client.silent_env() if silent else None,
             stderr=subprocess.DEVNULL if silent else None,
             stdout=subprocess.DEVNULL if silent else None,
             timeout=TTS_TIMEOUT
         )
         return True
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError):
+    except subprocess.TimeoutExpired:
         return False
 
 
@@ -139,38 +424,46 @@ def process_transcript(transcript_path: str, output_file: str) -> bool:
     if not os.path.exists(transcript_path):
         return False
     
-    chat_data = []
+    # Stream entries straight into the output array instead of building
+    # the whole transcript in memory; written atomically like write_json_atomic
+    output_path = Path(output_file)
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
     try:
-        with open(transcript_path, 'r') as f:
-            for line in f:
+        with open(transcript_path, 'rb', buffering=TRANSCRIPT_BUFFER_SIZE) as f_in, \
+                open(tmp_path, 'wb', buffering=TRANSCRIPT_BUFFER_SIZE) as f_out:
+            separator = b'['
+            for line in f_in:
                 line = line.strip()
-                if line:
-                    try:
-                        chat_data.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        pass  # Skip invalid lines
-        
-        # Write to output file
-        with open(output_file, 'w') as f:
-            json.dump(chat_data, f, indent=2)
+                if not line:
+                    continue
+                try:
+                    entry = loads_json(line)
+                except json.JSONDecodeError:
+                    continue  # Skip invalid lines
+                f_out.write(separator)
+                f_out.write(dumps_json(entry))
+                separator = b','
+            f_out.write(b']' if separator == b',' else b'[]')
+        os.replace(tmp_path, output_path)
         return True
     except IOError:
+        try:
+            tmp_path.unlink()
+        except IOError:
+            pass
         return False
 
 
-def get_llm_message(message_type: str = "completion") -> Optional[str]:
-    """Generate a message using available LLM services.
+@functools.lru_cache(maxsize=1)
+def get_llm_options() -> List[Tuple[Path, int]]:
+    """Resolve the usable LLM scripts once per process.
     
     Priority: OpenAI > Anthropic > Ollama
     
-    Args:
-        message_type: Type of message to generate (e.g., "completion")
-        
     Returns:
-        Generated message or None if generation fails
+        (script path, timeout) pairs whose API key is set and script exists
     """
-    script_dir = Path(__file__).parent.parent
-    llm_dir = script_dir / "utils" / "llm"
+    llm_dir = Path(__file__).parent / "llm"
     
     llm_options = [
         ('OPENAI_API_KEY', 'oai.py', 10),
@@ -178,20 +471,34 @@ def get_llm_message(message_type: str = "completion") -> Optional[str]:
         (None, 'ollama.py', 10)  # Local, no API key needed
     ]
     
-    for api_key_env, script_name, timeout in llm_options:
-        if api_key_env is None or os.getenv(api_key_env):
-            script_path = llm_dir / script_name
-            if script_path.exists():
-                try:
-                    result = subprocess.run(
-                        ["uv", "run", str(script_path), f"--{message_type}"],
-                        capture_output=True,
-                        text=True,
-                        timeout=timeout
-                    )
-                    if result.returncode == 0 and result.stdout.strip():
-                        return result.stdout.strip()
-                except (subprocess.TimeoutExpired, subprocess.SubprocessError):
-                    continue
+    return [
+        (llm_dir / script_name, timeout)
+        for api_key_env, script_name, timeout in llm_options
+        if (api_key_env is None or os.getenv(api_key_env))
+        and (llm_dir / script_name).exists()
+    ]
+
+
+def get_llm_message(message_type: str = "completion") -> Optional[str]:
+    """Generate a message using available LLM services.
     
-    return None
\ No newline at end of file
+    Args:
+        message_type: Type of message to generate (e.g., "completion")
+        
+    Returns:
+        Generated message or None if generation fails
+    """
+    for script_path, timeout in get_llm_options():
+        try:
+            result = subprocess.run(
+                ["uv", "run", str(script_path), f"--{message_type}"],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        except (subprocess.TimeoutExpired, subprocess.SubprocessError):
+            continue
+    
+    return None
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Shared entry-point scaffold for hook scripts.
+
+Reads the hook event from stdin, appends it to the hook's JSON Lines log
+and hands it to the hook-specific handler.
+"""
+
+import json
+import subprocess
+import sys
+from typing import Any, Callable, Dict, NoReturn, Optional
+
+from utils.common import append_json_log, ensure_log_dir, loads_json
+
+
+# Failures expected from hook I/O, JSON and TTS/LLM subprocesses; anything
+# else is left to propagate so it shows up as a hook error
+EXPECTED_ERRORS = (OSError, json.JSONDecodeError, subprocess.SubprocessError)
+
+# Handlers receive the parsed event and return the hook exit code
+# (None means 0; 2 blocks the action in Claude Code)
+HookHandler = Callable[[Dict[str, Any]], Optional[int]]
+
+
+def log_event(hook_name: str, input_data: Dict[str, Any]) -> None:
+    """Append a hook event to logs/<hook_name>.jsonl.
+
+    Args:
+        hook_name: Name of the hook, used as the log file stem
+        input_data: The event data to log
+    """
+    log_file = ensure_log_dir() / f"{hook_name}.jsonl"
+    if not append_json_log(log_file, input_data):
+        record_error(hook_name, OSError(f"Could not write {log_file}"))
+
+
+def record_error(hook_name: str, error: BaseException) -> None:
+    """Append a hook failure that was recovered from to logs/hook_errors.jsonl.
+
+    Args:
+        hook_name: Name of the hook that failed
+        error: The exception that was caught
+    """
+    try:
+        append_json_log(ensure_log_dir() / "hook_errors.jsonl", {
+            "hook": hook_name,
+            "error": type(error).__name__,
+            "message": str(error),
+        })
+    except OSError:
+        pass  # Never fail the hook because error logging failed
+
+
+def run(hook_name: str, handler: HookHandler, log_input: bool = True) -> NoReturn:
+    """Run a hook handler against the event on stdin and exit.
+
+    Args:
+        hook_name: Name of the hook, used for the event log
+        handler: Hook-specific logic; its return value is the exit code
+        log_input: Whether to log the event before calling the handler
+    """
+    try:
+        # Nothing to do for spurious invocations without input
+        raw_data = sys.stdin.buffer.read()
+        if not raw_data.strip():
+            sys.exit(0)
+
+        # Read and parse JSON input
+        try:
+            input_data = loads_json(raw_data)
+        except json.JSONDecodeError:
+            sys.exit(0)  # Gracefully exit on invalid JSON
+
+        if log_input:
+            log_event(hook_name, input_data)
+
+        sys.exit(handler(input_data) or 0)
+
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except EXPECTED_ERRORS as e:
+        record_error(hook_name, e)
+        sys.exit(0)  # Exit gracefully on expected errors
@@ -0,0 +1 @@
+"""Text-to-speech scripts, daemon and client used by the hooks."""
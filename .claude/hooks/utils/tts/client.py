@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Client for the TTS daemon.
+
+Hooks hand announcements to a long-running ttsd.py process over a UNIX
+socket instead of starting a fresh `uv run` interpreter per message.
+When the daemon is not running it is spawned in the background and the
+message is spoken through a detached one-shot elevenlabs_tts.py instead.
+"""
+
+import functools
+import os
+import socket
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # fcntl is POSIX-only; daemon starts go unguarded elsewhere
+
+
+# Constants
+SOCKET_PATH = Path.home() / ".claude" / "tts.sock"
+LOCK_PATH = Path.home() / ".claude" / "tts.lock"  # Held by the running daemon
+CONNECT_TIMEOUT = 0.5
+TTS_DIR = Path(__file__).parent
+DAEMON_SCRIPT = TTS_DIR / "ttsd.py"
+FALLBACK_SCRIPT = TTS_DIR / "elevenlabs_tts.py"
+
+
+def send_to_daemon(message: str) -> None:
+    """Send a message to the running TTS daemon.
+
+    Args:
+        message: Text to speak
+
+    Raises:
+        OSError: If the daemon is not reachable
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("UNIX sockets are not supported on this platform")
+
+    line = " ".join(message.split()) + "\n"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(SOCKET_PATH))
+        sock.sendall(line.encode("utf-8"))
+
+
+def spawn_detached(args: List[str], env: Optional[Dict[str, str]] = None) -> None:
+    """Start a process in its own session without waiting for it.
+
+    Args:
+        args: Command line to run
+        env: Environment for the child (inherits the hook's when None)
+    """
+    subprocess.Popen(
+        args,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def silent_env() -> Dict[str, str]:
+    """Environment for TTS children with console output suppressed.
+
+    Built on first use rather than at import so that variables loaded
+    from .env by the calling hook are included.
+
+    Returns:
+        Copy of the process environment with TTS_SILENT_MODE set
+    """
+    return {**os.environ, 'TTS_SILENT_MODE': 'true'}
+
+
+def daemon_lock_held() -> bool:
+    """Check whether a daemon is starting up or running.
+    
+    Returns:
+        True if another process holds the daemon lock
+    """
+    if fcntl is None:
+        return False
+    
+    fd = os.open(LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+def start_daemon() -> None:
+    """Launch the TTS daemon detached from the calling hook.
+    
+    Does nothing while another daemon holds the lock, so hooks firing
+    during a slow daemon start-up don't spawn competing daemons.
+    """
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if daemon_lock_held():
+        return
+    spawn_detached(["uv", "run", str(DAEMON_SCRIPT)])
+
+
+def speak(message: str) -> None:
+    """Speak a message without blocking the calling hook.
+
+    Args:
+        message: Text to speak
+    """
+    try:
+        send_to_daemon(message)
+        return
+    except OSError:
+        pass
+
+    # Cold start: bring the daemon up for later calls and speak this
+    # message through a detached one-shot script
+    start_daemon()
+
+    spawn_detached(["uv", "run", str(FALLBACK_SCRIPT), message], env=silent_env())
@@ -12,6 +12,11 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Voice settings shared with the TTS daemon (ttsd.py)
+VOICE_ID = "ckl5VaynG4D0hRlNGmde"
+MODEL_ID = "eleven_turbo_v2_5"
+OUTPUT_FORMAT = "mp3_44100_128"
+
 def main():
     """
     ElevenLabs Turbo v2.5 TTS Script
@@ -69,9 +74,9 @@ def main():
             # Generate and play audio directly
             audio = elevenlabs.text_to_speech.convert(
                 text=text,
-                voice_id="ckl5VaynG4D0hRlNGmde",  # Specified voice
-                model_id="eleven_turbo_v2_5",
-                output_format="mp3_44100_128",
+                voice_id=VOICE_ID,
+                model_id=MODEL_ID,
+                output_format=OUTPUT_FORMAT,
             )
             
             play(audio)
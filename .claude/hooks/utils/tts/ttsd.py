@@ -0,0 +1,156 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# dependencies = [
+#     "elevenlabs",
+#     "python-dotenv",
+# ]
+# ///
+
+"""ElevenLabs TTS daemon.
+
+Keeps a single ElevenLabs client loaded and speaks newline-delimited
+messages received on the socket from client.py, one at a time and in
+arrival order. Started on demand by client.speak() and exits after
+IDLE_TIMEOUT seconds without messages.
+"""
+
+import fcntl
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+
+from client import LOCK_PATH, SOCKET_PATH
+from elevenlabs_tts import VOICE_ID, MODEL_ID, OUTPUT_FORMAT
+
+
+# Constants
+IDLE_TIMEOUT = 600
+READ_TIMEOUT = 2
+LOCK_ATTEMPTS = 5  # Tolerate brief lock probes from client.start_daemon
+LOCK_RETRY_DELAY = 0.1
+
+
+def acquire_daemon_lock() -> Optional[int]:
+    """Take the daemon lock, held for the life of the process.
+    
+    Returns:
+        Lock file descriptor, or None if another daemon holds the lock
+    """
+    LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o600)
+    for _ in range(LOCK_ATTEMPTS):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            time.sleep(LOCK_RETRY_DELAY)
+    os.close(fd)
+    return None
+
+
+def bind_socket() -> socket.socket:
+    """Bind the daemon socket, replacing any stale one.
+    
+    Must be called with the daemon lock held, so no live daemon owns
+    the existing socket file.
+    
+    Returns:
+        Listening socket
+    """
+    try:
+        SOCKET_PATH.unlink()
+    except FileNotFoundError:
+        pass
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(SOCKET_PATH))
+    server.listen()
+    server.settimeout(IDLE_TIMEOUT)
+    return server
+
+
+def speak_worker(elevenlabs: Any, play: Any, messages: "queue.Queue[str]") -> None:
+    """Speak queued messages with one reused ElevenLabs client.
+
+    Args:
+        elevenlabs: ElevenLabs client
+        play: Audio playback function
+        messages: Queue of messages to speak
+    """
+    while True:
+        text = messages.get()
+        try:
+            audio = elevenlabs.text_to_speech.convert(
+                text=text,
+                voice_id=VOICE_ID,
+                model_id=MODEL_ID,
+                output_format=OUTPUT_FORMAT,
+            )
+            play(audio)
+        except Exception:
+            pass  # Skip messages that fail to synthesize or play
+        finally:
+            messages.task_done()
+
+
+def main() -> None:
+    """Serve TTS requests until idle."""
+    load_dotenv()
+    if not os.getenv('ELEVENLABS_API_KEY'):
+        sys.exit(1)
+
+    if acquire_daemon_lock() is None:
+        sys.exit(0)  # Another daemon is starting or running
+
+    # Set up the client before binding, so a broken SDK install exits
+    # instead of serving a socket nobody can speak for
+    try:
+        from elevenlabs.client import ElevenLabs
+        from elevenlabs import play
+        elevenlabs = ElevenLabs(api_key=os.getenv('ELEVENLABS_API_KEY'))
+    except Exception:
+        sys.exit(1)
+
+    server = bind_socket()
+
+    messages: "queue.Queue[str]" = queue.Queue()
+    threading.Thread(
+        target=speak_worker, args=(elevenlabs, play, messages), daemon=True
+    ).start()
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+
+            conn.settimeout(READ_TIMEOUT)
+            try:
+                with conn, conn.makefile('r', encoding='utf-8') as f:
+                    for line in f:
+                        text = line.strip()
+                        if text:
+                            messages.put(text)
+            except (OSError, UnicodeDecodeError):
+                pass  # Drop malformed or stalled clients
+    finally:
+        server.close()
+        try:
+            SOCKET_PATH.unlink()
+        except FileNotFoundError:
+            pass
+
+    # Finish speaking anything already queued before exiting
+    messages.join()
+
+
+if __name__ == "__main__":
+    main()